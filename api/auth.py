@@ -1,14 +1,32 @@
 """
 API key authentication for FastAPI endpoints.
 """
+import hmac
+
 from fastapi import Security, HTTPException, status
 from fastapi.security import APIKeyHeader
 
-from api.config import API_SERVER_KEY
+from api.config import CFG
 
 # Define API key header
 api_key_header = APIKeyHeader(name="X-API-Key", auto_error=False)
 
+# Bound once at import so the per-request path avoids attribute lookups
+_API_KEY_BYTES = CFG.api_key_bytes
+
+# Built once; raising a shared instance avoids reconstructing the exception
+# and its headers dict on every rejected request
+_MISSING_KEY = HTTPException(
+    status_code=status.HTTP_401_UNAUTHORIZED,
+    detail="Missing API key. Include X-API-Key header in your request.",
+    headers={"WWW-Authenticate": "ApiKey"},
+)
+_INVALID_KEY = HTTPException(
+    status_code=status.HTTP_401_UNAUTHORIZED,
+    detail="Invalid API key",
+    headers={"WWW-Authenticate": "ApiKey"},
+)
+
 
 async def validate_api_key(api_key: str = Security(api_key_header)) -> str:
     """
@@ -24,17 +42,12 @@ async def validate_api_key(api_key: str = Security(api_key_header)) -> str:
         HTTPException: 401 if API key is missing or invalid
     """
     if api_key is None:
-        raise HTTPException(
-            status_code=status.HTTP_401_UNAUTHORIZED,
-            detail="Missing API key. Include X-API-Key header in your request.",
-            headers={"WWW-Authenticate": "ApiKey"},
-        )
-
-    if api_key != API_SERVER_KEY:
-        raise HTTPException(
-            status_code=status.HTTP_401_UNAUTHORIZED,
-            detail="Invalid API key",
-            headers={"WWW-Authenticate": "ApiKey"},
-        )
+        raise _MISSING_KEY
+
+    # Constant-time comparison to avoid leaking key contents via timing.
+    # No length pre-check: compare_digest already handles unequal lengths
+    # without revealing which length is valid.
+    if not hmac.compare_digest(api_key.encode("utf-8"), _API_KEY_BYTES):
+        raise _INVALID_KEY
 
     return api_key
@@ -3,6 +3,7 @@ Configuration management for Browser-Use API Server.
 Loads environment variables and defines configuration constants.
 """
 import os
+from dataclasses import dataclass
 from pathlib import Path
 from dotenv import load_dotenv
 
@@ -18,6 +19,9 @@ if not API_SERVER_KEY:
         f"Please add it to {ENV_FILE}"
     )
 
+# Pre-encoded key for the auth hot path (avoids per-request .encode())
+API_SERVER_KEY_BYTES = API_SERVER_KEY.encode("utf-8")
+
 API_HOST = os.getenv("API_HOST", "0.0.0.0")
 API_PORT = int(os.getenv("API_PORT", "8000"))
 
@@ -33,6 +37,7 @@ DATABASE_PATH = os.getenv(
 
 # Task Queue Configuration
 MAX_QUEUE_SIZE = int(os.getenv("MAX_QUEUE_SIZE", "100"))
+TASK_CONCURRENCY = int(os.getenv("TASK_CONCURRENCY", "3"))
 DEFAULT_TASK_TIMEOUT = int(os.getenv("DEFAULT_TASK_TIMEOUT", "300"))  # 5 minutes
 MIN_TASK_TIMEOUT = 30  # 30 seconds
 MAX_TASK_TIMEOUT = 3600  # 1 hour
@@ -41,6 +46,8 @@ MAX_TASK_TIMEOUT = 3600  # 1 hour
 WEBHOOK_RETRY_ATTEMPTS = int(os.getenv("WEBHOOK_RETRY_ATTEMPTS", "3"))
 WEBHOOK_RETRY_DELAY = int(os.getenv("WEBHOOK_RETRY_DELAY", "2"))  # seconds
 WEBHOOK_TIMEOUT = int(os.getenv("WEBHOOK_TIMEOUT", "10"))  # seconds
+WEBHOOK_MAX_DELAY = int(os.getenv("WEBHOOK_MAX_DELAY", "32"))  # seconds
+CALLBACK_BUDGET = int(os.getenv("CALLBACK_BUDGET", "15"))  # seconds reserved for finalization
 
 # Logging Configuration
 LOG_DIR = PROJECT_ROOT / "logs"
@@ -55,3 +62,42 @@ OPENAI_API_KEY = os.getenv("OPENAI_API_KEY")
 GOOGLE_API_KEY = os.getenv("GOOGLE_API_KEY")
 DEEPSEEK_API_KEY = os.getenv("DEEPSEEK_API_KEY")
 BROWSER_USE_API_KEY = os.getenv("BROWSER_USE_API_KEY")
+
+
+@dataclass(frozen=True, slots=True)
+class Config:
+    """
+    Immutable snapshot of server configuration.
+    Hot paths bind a field locally once instead of doing a module-dict
+    lookup per reference.
+    """
+    api_key: str
+    api_key_bytes: bytes
+    host: str
+    port: int
+    cdp_url: str
+    database_path: str
+    max_queue_size: int
+    default_task_timeout: int
+    webhook_retry_attempts: int
+    webhook_retry_delay: int
+    webhook_timeout: int
+    webhook_max_delay: int
+    callback_budget: int
+
+
+CFG = Config(
+    api_key=API_SERVER_KEY,
+    api_key_bytes=API_SERVER_KEY_BYTES,
+    host=API_HOST,
+    port=API_PORT,
+    cdp_url=CHROME_CDP_URL,
+    database_path=DATABASE_PATH,
+    max_queue_size=MAX_QUEUE_SIZE,
+    default_task_timeout=DEFAULT_TASK_TIMEOUT,
+    webhook_retry_attempts=WEBHOOK_RETRY_ATTEMPTS,
+    webhook_retry_delay=WEBHOOK_RETRY_DELAY,
+    webhook_timeout=WEBHOOK_TIMEOUT,
+    webhook_max_delay=WEBHOOK_MAX_DELAY,
+    callback_budget=CALLBACK_BUDGET,
+)
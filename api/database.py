@@ -1,80 +1,258 @@
 """
 Database operations for task storage using SQLite with WAL mode.
 """
-import json
+import asyncio
+import sqlite3
 import aiosqlite
-from datetime import datetime
-from typing import Optional, List, Dict, Any
+from contextlib import asynccontextmanager
+from datetime import datetime, timezone
+from typing import Optional, List, Dict, Any, Union
 from pathlib import Path
+from uuid import UUID
 
 from api.config import DATABASE_PATH
 
+# orjson is 2-5x faster than stdlib json; fall back to stdlib where it
+# isn't installed. Decode to str so the form_data TEXT column stores the
+# same type regardless of which serializer is available.
+try:
+    import orjson
+
+    def _json_dumps(obj):
+        return orjson.dumps(obj).decode()
+
+    _json_loads = orjson.loads
+except ImportError:
+    import json
+
+    def _json_dumps(obj):
+        return json.dumps(obj)
+
+    _json_loads = json.loads
+
+# Number of read-only connections kept in the pool
+READER_POOL_SIZE = 4
+
+# Columns backing the TaskStatus response model. The status/list endpoints
+# never need form_data (potentially a large blob) or the callback fields,
+# so don't drag them through the aiosqlite worker thread.
+_TASK_STATUS_COLS = (
+    "task_id, status, url, task_description, result, error, "
+    "created_at, started_at, completed_at"
+)
+
+# Full row for internal consumers (the task worker needs form_data,
+# callback_url and timeout).
+_TASK_FULL_COLS = (
+    "task_id, url, task_description, form_data, callback_url, timeout, "
+    "status, result, error, callback_attempts, last_callback_error, "
+    "created_at, started_at, completed_at"
+)
+
+# Have SQLite hand back datetime objects for TIMESTAMP columns so callers
+# never re-parse ISO strings row by row.
+sqlite3.register_converter(
+    "TIMESTAMP", lambda value: datetime.fromisoformat(value.decode())
+)
+
+# Bind uuid.UUID parameters directly; callers keep the 16-byte object
+# internally and sqlite serializes it once at the boundary.
+sqlite3.register_adapter(UUID, str)
+
+# Fixed-width UTC timestamp format: sorts lexically and avoids the
+# deprecated datetime.utcnow() plus isoformat() machinery on hot writes.
+_ISO_UTC = "%Y-%m-%dT%H:%M:%S.%fZ"
+
+
+def _utc_iso(dt: datetime) -> str:
+    """Format a UTC datetime for storage."""
+    return dt.strftime(_ISO_UTC)
+
+
+def _now_iso() -> str:
+    """Current UTC time in storage format."""
+    return datetime.now(timezone.utc).strftime(_ISO_UTC)
+
 
 class TaskDatabase:
     """Manages SQLite database operations for tasks."""
 
+    # Static statements for the fixed task-lifecycle transitions. Keeping
+    # these as constants (instead of building SQL per call) lets aiosqlite's
+    # statement cache reuse the prepared program on every state change.
+    _SQL_MARK_RUNNING = (
+        "UPDATE tasks SET status = 'running', started_at = ? WHERE task_id = ?"
+    )
+    _SQL_MARK_COMPLETED = (
+        "UPDATE tasks SET status = 'completed', completed_at = ?, result = ? "
+        "WHERE task_id = ?"
+    )
+    _SQL_MARK_FAILED = (
+        "UPDATE tasks SET status = ?, completed_at = ?, error = ? "
+        "WHERE task_id = ?"
+    )
+    _SQL_UPDATE_CALLBACK = (
+        "UPDATE tasks SET callback_attempts = ?, last_callback_error = ? "
+        "WHERE task_id = ?"
+    )
+
     def __init__(self, db_path: str = DATABASE_PATH):
         self.db_path = db_path
         Path(db_path).parent.mkdir(parents=True, exist_ok=True)
+        # One writer connection serialized behind a lock, plus a pool of
+        # read-only connections so reads run concurrently against WAL
+        # snapshots instead of queueing behind writes.
+        self._writer: Optional[aiosqlite.Connection] = None
+        self._readers: asyncio.Queue = asyncio.Queue()
+        self._write_lock = asyncio.Lock()
 
     async def initialize(self):
         """Initialize database with schema and enable WAL mode."""
-        async with aiosqlite.connect(self.db_path) as db:
-            # Enable WAL mode for concurrent access
-            await db.execute("PRAGMA journal_mode=WAL")
-
-            # Create tasks table
-            await db.execute("""
-                CREATE TABLE IF NOT EXISTS tasks (
-                    task_id TEXT PRIMARY KEY,
-                    url TEXT NOT NULL,
-                    task_description TEXT NOT NULL,
-                    form_data TEXT,
-                    callback_url TEXT,
-                    timeout INTEGER NOT NULL,
-                    status TEXT NOT NULL,
-                    result TEXT,
-                    error TEXT,
-                    callback_attempts INTEGER DEFAULT 0,
-                    last_callback_error TEXT,
-                    created_at TIMESTAMP NOT NULL,
-                    started_at TIMESTAMP,
-                    completed_at TIMESTAMP
-                )
-            """)
-
-            # Create index on status for faster queries
-            await db.execute("""
-                CREATE INDEX IF NOT EXISTS idx_tasks_status
-                ON tasks(status)
-            """)
-
-            # Create index on created_at for sorting
-            await db.execute("""
-                CREATE INDEX IF NOT EXISTS idx_tasks_created_at
-                ON tasks(created_at DESC)
-            """)
+        self._writer = await aiosqlite.connect(
+            self.db_path, detect_types=sqlite3.PARSE_DECLTYPES
+        )
+        self._writer.row_factory = aiosqlite.Row
+
+        # Enable WAL mode for concurrent access
+        await self._writer.execute("PRAGMA journal_mode=WAL")
+
+        # WAL makes NORMAL durable enough for task state; FULL fsyncs twice
+        # per commit. busy_timeout avoids spurious SQLITE_BUSY errors when
+        # the API and the worker write concurrently.
+        await self._writer.execute("PRAGMA synchronous=NORMAL")
+        await self._writer.execute("PRAGMA busy_timeout=30000")
+        await self._writer.execute("PRAGMA temp_store=MEMORY")
+        await self._writer.execute("PRAGMA mmap_size=268435456")
+        await self._writer.execute("PRAGMA cache_size=-64000")
+        await self._writer.execute("PRAGMA wal_autocheckpoint=1000")
+
+        # Create tasks table
+        await self._writer.execute("""
+            CREATE TABLE IF NOT EXISTS tasks (
+                task_id TEXT PRIMARY KEY,
+                url TEXT NOT NULL,
+                task_description TEXT NOT NULL,
+                form_data TEXT,
+                callback_url TEXT,
+                timeout INTEGER NOT NULL,
+                status TEXT NOT NULL,
+                result TEXT,
+                error TEXT,
+                callback_attempts INTEGER DEFAULT 0,
+                last_callback_error TEXT,
+                created_at TIMESTAMP NOT NULL,
+                started_at TIMESTAMP,
+                completed_at TIMESTAMP
+            )
+        """)
+
+        # Composite index for the filtered list query
+        # (WHERE status = ? ORDER BY created_at DESC): satisfies both the
+        # filter and the sort in one index scan. Its left prefix also covers
+        # plain status lookups, so drop the old single-column index.
+        await self._writer.execute("""
+            CREATE INDEX IF NOT EXISTS idx_tasks_status_created
+            ON tasks(status, created_at DESC)
+        """)
+        await self._writer.execute("DROP INDEX IF EXISTS idx_tasks_status")
+
+        # Create index on created_at for sorting
+        await self._writer.execute("""
+            CREATE INDEX IF NOT EXISTS idx_tasks_created_at
+            ON tasks(created_at DESC)
+        """)
+
+        # Partial index covering only in-flight tasks. Terminal rows
+        # (completed/failed/timeout) dominate over time, so this stays tiny
+        # and keeps startup recovery and queue scans index-driven.
+        await self._writer.execute("""
+            CREATE INDEX IF NOT EXISTS idx_tasks_active
+            ON tasks(status, created_at)
+            WHERE status IN ('queued', 'running')
+        """)
+
+        # Rows written before the fixed "...Z" storage format lack the
+        # suffix; normalize them once so TEXT ordering stays uniform and
+        # the keyset cursor never re-emits a legacy row on the next page.
+        await self._writer.execute(
+            "UPDATE tasks SET created_at = created_at || 'Z' "
+            "WHERE created_at NOT LIKE '%Z'"
+        )
+        await self._writer.execute(
+            "UPDATE tasks SET started_at = started_at || 'Z' "
+            "WHERE started_at NOT LIKE '%Z'"
+        )
+        await self._writer.execute(
+            "UPDATE tasks SET completed_at = completed_at || 'Z' "
+            "WHERE completed_at NOT LIKE '%Z'"
+        )
+
+        await self._writer.commit()
+
+        # Open the reader pool after the schema exists
+        for _ in range(READER_POOL_SIZE):
+            reader = await aiosqlite.connect(
+                self.db_path, detect_types=sqlite3.PARSE_DECLTYPES
+            )
+            reader.row_factory = aiosqlite.Row
+            await reader.execute("PRAGMA query_only=1")
+            await reader.execute("PRAGMA busy_timeout=30000")
+            await reader.execute("PRAGMA mmap_size=268435456")
+            await reader.execute("PRAGMA cache_size=-64000")
+            self._readers.put_nowait(reader)
+
+    @asynccontextmanager
+    async def _acquire_reader(self):
+        """Borrow a read-only connection from the pool."""
+        reader = await self._readers.get()
+        try:
+            yield reader
+        finally:
+            self._readers.put_nowait(reader)
+
+    async def ping(self):
+        """
+        Verify the database is reachable with a trivial SELECT 1.
+        Used by the health check; skips row lookup and conversion entirely.
+        """
+        async with self._acquire_reader() as reader:
+            await reader.execute("SELECT 1")
 
-            await db.commit()
+    async def optimize(self):
+        """
+        Run PRAGMA optimize to refresh planner statistics.
+        Cheap when nothing changed; called periodically from the server.
+        """
+        async with self._write_lock:
+            await self._writer.execute("PRAGMA optimize")
+
+    async def close(self):
+        """Close all database connections (called on application shutdown)."""
+        if self._writer:
+            await self._writer.close()
+            self._writer = None
+        while not self._readers.empty():
+            reader = self._readers.get_nowait()
+            await reader.close()
 
     async def mark_incomplete_as_failed(self):
         """
         Mark all queued or running tasks as failed on server startup.
         This prevents orphaned tasks from appearing stuck forever.
         """
-        async with aiosqlite.connect(self.db_path) as db:
-            await db.execute("""
+        async with self._write_lock:
+            await self._writer.execute("""
                 UPDATE tasks
                 SET status = 'failed',
                     error = 'Server restarted during execution',
                     completed_at = ?
                 WHERE status IN ('queued', 'running')
-            """, (datetime.utcnow().isoformat(),))
-            await db.commit()
+            """, (_now_iso(),))
+            await self._writer.commit()
 
     async def create_task(
         self,
-        task_id: str,
+        task_id: Union[str, UUID],
         url: str,
         task_description: str,
         form_data: Dict[str, Any],
@@ -82,10 +260,10 @@ class TaskDatabase:
         timeout: int
     ) -> Dict[str, Any]:
         """Create a new task in the database."""
-        now = datetime.utcnow()
+        now = datetime.now(timezone.utc)
 
-        async with aiosqlite.connect(self.db_path) as db:
-            await db.execute("""
+        async with self._write_lock:
+            await self._writer.execute("""
                 INSERT INTO tasks (
                     task_id, url, task_description, form_data,
                     callback_url, timeout, status, created_at
@@ -95,25 +273,36 @@ class TaskDatabase:
                 task_id,
                 url,
                 task_description,
-                json.dumps(form_data),
+                _json_dumps(form_data),
                 callback_url,
                 timeout,
-                now.isoformat()
+                _utc_iso(now)
             ))
-            await db.commit()
+            await self._writer.commit()
 
         return {
-            "task_id": task_id,
+            "task_id": str(task_id),
             "status": "queued",
             "created_at": now
         }
 
-    async def get_task(self, task_id: str) -> Optional[Dict[str, Any]]:
-        """Retrieve a task by ID."""
-        async with aiosqlite.connect(self.db_path) as db:
-            db.row_factory = aiosqlite.Row
-            async with db.execute(
-                "SELECT * FROM tasks WHERE task_id = ?",
+    async def get_task(self, task_id: Union[str, UUID]) -> Optional[Dict[str, Any]]:
+        """Retrieve a task by ID (status fields only)."""
+        async with self._acquire_reader() as reader:
+            async with reader.execute(
+                f"SELECT {_TASK_STATUS_COLS} FROM tasks WHERE task_id = ?",
+                (task_id,)
+            ) as cursor:
+                row = await cursor.fetchone()
+                if row:
+                    return dict(row)
+                return None
+
+    async def get_task_full(self, task_id: Union[str, UUID]) -> Optional[Dict[str, Any]]:
+        """Retrieve a full task row, including form_data and callback fields."""
+        async with self._acquire_reader() as reader:
+            async with reader.execute(
+                f"SELECT {_TASK_FULL_COLS} FROM tasks WHERE task_id = ?",
                 (task_id,)
             ) as cursor:
                 row = await cursor.fetchone()
@@ -125,106 +314,254 @@ class TaskDatabase:
         self,
         status: Optional[str] = None,
         limit: int = 50,
-        offset: int = 0
-    ) -> tuple[List[Dict[str, Any]], int]:
-        """
-        List tasks with optional filtering and pagination.
-        Returns (tasks, total_count).
+        cursor: Optional[tuple[str, str]] = None
+    ) -> tuple[List[Dict[str, Any]], int, Optional[tuple[str, str]]]:
         """
-        async with aiosqlite.connect(self.db_path) as db:
-            db.row_factory = aiosqlite.Row
-
-            # Build query based on filter
-            if status:
-                query = "SELECT * FROM tasks WHERE status = ? ORDER BY created_at DESC LIMIT ? OFFSET ?"
-                count_query = "SELECT COUNT(*) FROM tasks WHERE status = ?"
-                params = (status, limit, offset)
-                count_params = (status,)
-            else:
-                query = "SELECT * FROM tasks ORDER BY created_at DESC LIMIT ? OFFSET ?"
-                count_query = "SELECT COUNT(*) FROM tasks"
-                params = (limit, offset)
-                count_params = ()
-
-            # Get tasks
-            async with db.execute(query, params) as cursor:
-                rows = await cursor.fetchall()
-                tasks = [dict(row) for row in rows]
-
-            # Get total count
-            async with db.execute(count_query, count_params) as cursor:
-                total = (await cursor.fetchone())[0]
-
-            return tasks, total
-
-    async def update_status(
-        self,
-        task_id: str,
-        status: str,
-        started_at: Optional[datetime] = None,
-        completed_at: Optional[datetime] = None,
-        result: Optional[str] = None,
-        error: Optional[str] = None
-    ):
-        """Update task status and related fields."""
-        async with aiosqlite.connect(self.db_path) as db:
-            updates = ["status = ?"]
-            params = [status]
-
-            if started_at:
-                updates.append("started_at = ?")
-                params.append(started_at.isoformat())
+        List tasks with optional filtering and keyset pagination.
 
-            if completed_at:
-                updates.append("completed_at = ?")
-                params.append(completed_at.isoformat())
+        The cursor is the (created_at, task_id) pair of the last row of the
+        previous page; rows strictly before it (in DESC order) are returned.
+        Unlike OFFSET, this never walks and discards skipped rows.
 
-            if result is not None:
-                updates.append("result = ?")
-                params.append(result)
-
-            if error is not None:
-                updates.append("error = ?")
-                params.append(error)
+        Returns (tasks, total_count, next_cursor). next_cursor is None when
+        there are no further pages. On cursor pages, total_count covers the
+        rows from the cursor onward rather than the whole table.
+        """
+        # Single windowed query: COUNT(*) OVER() returns the filtered total
+        # on every row, avoiding a second full scan per list call.
+        columns = f"{_TASK_STATUS_COLS}, COUNT(*) OVER() AS total_count"
+
+        where = []
+        params: list = []
+        if status:
+            where.append("status = ?")
+            params.append(status)
+        if cursor:
+            where.append("(created_at, task_id) < (?, ?)")
+            params.extend(cursor)
+
+        query = f"SELECT {columns} FROM tasks"
+        if where:
+            query += " WHERE " + " AND ".join(where)
+        query += " ORDER BY created_at DESC, task_id DESC LIMIT ?"
+        params.append(limit)
+
+        # Drain the cursor in small batches rather than one fetchall, so we
+        # never hold rows + dicts for the whole page in memory at once
+        tasks: List[Dict[str, Any]] = []
+        async with self._acquire_reader() as reader:
+            async with reader.execute(query, params) as cursor_obj:
+                while True:
+                    batch = await cursor_obj.fetchmany(32)
+                    if not batch:
+                        break
+                    tasks.extend(dict(row) for row in batch)
+
+        if not tasks:
+            return [], 0, None
+
+        total = tasks[0]["total_count"]
+
+        next_cursor = None
+        if len(tasks) == limit:
+            last = tasks[-1]
+            # Cursor keeps the stored ISO form so it compares against the
+            # TEXT column exactly as written
+            next_cursor = (_utc_iso(last["created_at"]), last["task_id"])
+
+        return tasks, total, next_cursor
+
+    async def mark_running(self, task_id: Union[str, UUID], started_at: datetime):
+        """Transition a task to 'running'."""
+        async with self._write_lock:
+            await self._writer.execute(
+                self._SQL_MARK_RUNNING,
+                (_utc_iso(started_at), task_id)
+            )
+            await self._writer.commit()
 
-            params.append(task_id)
+    async def mark_completed(
+        self,
+        task_id: Union[str, UUID],
+        completed_at: datetime,
+        result: Optional[str]
+    ):
+        """Transition a task to 'completed' with its result."""
+        async with self._write_lock:
+            await self._writer.execute(
+                self._SQL_MARK_COMPLETED,
+                (_utc_iso(completed_at), result, task_id)
+            )
+            await self._writer.commit()
 
-            await db.execute(
-                f"UPDATE tasks SET {', '.join(updates)} WHERE task_id = ?",
-                params
+    async def mark_failed(
+        self,
+        task_id: Union[str, UUID],
+        status: str,
+        completed_at: datetime,
+        error: Optional[str]
+    ):
+        """Transition a task to a terminal error state ('failed' or 'timeout')."""
+        async with self._write_lock:
+            await self._writer.execute(
+                self._SQL_MARK_FAILED,
+                (status, _utc_iso(completed_at), error, task_id)
             )
-            await db.commit()
+            await self._writer.commit()
 
     async def update_callback_attempt(
         self,
-        task_id: str,
+        task_id: Union[str, UUID],
         attempts: int,
         error: Optional[str] = None
     ):
         """Update callback attempt count and error."""
-        async with aiosqlite.connect(self.db_path) as db:
-            await db.execute("""
-                UPDATE tasks
-                SET callback_attempts = ?,
-                    last_callback_error = ?
-                WHERE task_id = ?
-            """, (attempts, error, task_id))
-            await db.commit()
+        async with self._write_lock:
+            await self._writer.execute(
+                self._SQL_UPDATE_CALLBACK,
+                (attempts, error, task_id)
+            )
+            await self._writer.commit()
 
-    async def delete_task(self, task_id: str) -> bool:
+    async def delete_task(self, task_id: Union[str, UUID]) -> bool:
         """
         Delete a task from the database.
         Returns True if task was deleted, False if not found.
         """
-        async with aiosqlite.connect(self.db_path) as db:
-            cursor = await db.execute(
+        async with self._write_lock:
+            cursor = await self._writer.execute(
                 "DELETE FROM tasks WHERE task_id = ?",
                 (task_id,)
             )
-            await db.commit()
+            await self._writer.commit()
             return cursor.rowcount > 0
 
 
+class StatusBatcher:
+    """
+    Coalesces task status UPDATEs into single commits.
+
+    A lone await still flushes within max_queue_time, but when several
+    workers finish tasks together their updates are grouped by statement
+    shape and written with one executemany + commit instead of one
+    transaction each.
+    """
+
+    def __init__(
+        self,
+        database: TaskDatabase,
+        max_batch_size: int = 50,
+        max_queue_time: float = 0.01
+    ):
+        self._db = database
+        self._max_batch_size = max_batch_size
+        self._max_queue_time = max_queue_time
+        self._pending: List[tuple] = []
+        self._wakeup = asyncio.Event()
+        self._flusher: Optional[asyncio.Task] = None
+        self._running = False
+
+    async def start(self):
+        """Start the background flusher."""
+        self._running = True
+        self._flusher = asyncio.create_task(self._flush_loop())
+
+    async def stop(self):
+        """Flush remaining updates and stop the flusher."""
+        self._running = False
+        self._wakeup.set()
+        if self._flusher:
+            await self._flusher
+            self._flusher = None
+
+    async def mark_running(self, task_id: Union[str, UUID], started_at: datetime):
+        """Queue a 'running' transition."""
+        await self._process(
+            TaskDatabase._SQL_MARK_RUNNING,
+            (_utc_iso(started_at), task_id)
+        )
+
+    async def mark_completed(
+        self,
+        task_id: Union[str, UUID],
+        completed_at: datetime,
+        result: Optional[str]
+    ):
+        """Queue a 'completed' transition."""
+        await self._process(
+            TaskDatabase._SQL_MARK_COMPLETED,
+            (_utc_iso(completed_at), result, task_id)
+        )
+
+    async def mark_failed(
+        self,
+        task_id: Union[str, UUID],
+        status: str,
+        completed_at: datetime,
+        error: Optional[str]
+    ):
+        """Queue a terminal error transition ('failed' or 'timeout')."""
+        await self._process(
+            TaskDatabase._SQL_MARK_FAILED,
+            (status, _utc_iso(completed_at), error, task_id)
+        )
+
+    async def update_callback_attempt(
+        self,
+        task_id: Union[str, UUID],
+        attempts: int,
+        error: Optional[str] = None
+    ):
+        """Queue a callback-attempt update."""
+        await self._process(
+            TaskDatabase._SQL_UPDATE_CALLBACK,
+            (attempts, error, task_id)
+        )
+
+    async def _process(self, sql: str, params: tuple):
+        """Queue one UPDATE and wait until it has been committed."""
+        future = asyncio.get_running_loop().create_future()
+        self._pending.append((sql, params, future))
+        self._wakeup.set()
+        await future
+
+    async def _flush_loop(self):
+        while True:
+            if not self._pending:
+                if not self._running:
+                    break
+                await self._wakeup.wait()
+                self._wakeup.clear()
+                continue
+
+            # Give a burst of concurrent writers a moment to pile up
+            if self._running and len(self._pending) < self._max_batch_size:
+                await asyncio.sleep(self._max_queue_time)
+
+            batch, self._pending = self._pending, []
+            try:
+                await self._flush(batch)
+            except Exception as e:
+                for _, _, future in batch:
+                    if not future.done():
+                        future.set_exception(e)
+
+    async def _flush(self, batch: List[tuple]):
+        # Group by statement shape so each shape is one executemany
+        groups: Dict[str, List[tuple]] = {}
+        for sql, params, _ in batch:
+            groups.setdefault(sql, []).append(params)
+
+        async with self._db._write_lock:
+            for sql, rows in groups.items():
+                await self._db._writer.executemany(sql, rows)
+            await self._db._writer.commit()
+
+        for _, _, future in batch:
+            if not future.done():
+                future.set_result(None)
+
+
 # Singleton instance
 db = TaskDatabase()
 
@@ -237,8 +574,6 @@ async def init_database():
 
 # For running as a script to initialize the database
 if __name__ == "__main__":
-    import asyncio
-
     async def main():
         print(f"Initializing database at {DATABASE_PATH}")
         await db.initialize()
@@ -246,9 +581,10 @@ if __name__ == "__main__":
         print(f"WAL mode enabled: Check {DATABASE_PATH}-wal file will be created on first write")
 
         # Verify WAL mode
-        async with aiosqlite.connect(DATABASE_PATH) as conn:
-            async with conn.execute("PRAGMA journal_mode") as cursor:
-                mode = await cursor.fetchone()
-                print(f"Journal mode: {mode[0]}")
+        async with db._writer.execute("PRAGMA journal_mode") as cursor:
+            mode = await cursor.fetchone()
+            print(f"Journal mode: {mode[0]}")
+
+        await db.close()
 
     asyncio.run(main())
@@ -104,7 +104,7 @@ class TaskListResponse(BaseModel):
     tasks: list[TaskStatus]
     total: int
     limit: int
-    offset: int
+    next_cursor: Optional[str] = None
 
     class Config:
         json_schema_extra = {
@@ -112,7 +112,7 @@ class TaskListResponse(BaseModel):
                 "tasks": [],
                 "total": 42,
                 "limit": 50,
-                "offset": 0
+                "next_cursor": "MjAyNS0xMi0xOVQxMDozMDowMHw1NTBlODQwMA=="
             }
         }
 
@@ -2,7 +2,11 @@
 FastAPI server for Browser-Use API.
 Provides HTTP endpoints for dynamic browser automation tasks.
 """
+import asyncio
+import base64
+import binascii
 import logging
+import time
 from contextlib import asynccontextmanager
 from datetime import datetime
 from uuid import uuid4
@@ -29,6 +33,42 @@ logging.basicConfig(level=logging.INFO)
 logger = logging.getLogger("api")
 
 
+# Chrome CDP probe cache: a burst of requests shares one probe instead of
+# each opening a fresh connection to GET /json/version.
+_CDP_PROBE_TTL = 1.0
+_cdp_cache = {"ts": 0.0, "ok": False}
+_cdp_lock = asyncio.Lock()
+
+
+async def _cdp_alive() -> bool:
+    """Check Chrome CDP availability, cached for a short TTL."""
+    if time.monotonic() - _cdp_cache["ts"] < _CDP_PROBE_TTL:
+        return _cdp_cache["ok"]
+
+    async with _cdp_lock:
+        # Another request may have refreshed the cache while we waited
+        if time.monotonic() - _cdp_cache["ts"] < _CDP_PROBE_TTL:
+            return _cdp_cache["ok"]
+
+        try:
+            response = await app.state.http.get(f"{CHROME_CDP_URL}/json/version")
+            ok = response.status_code == 200
+        except Exception as e:
+            logger.error(f"Chrome CDP probe failed: {e}")
+            ok = False
+
+        _cdp_cache["ok"] = ok
+        _cdp_cache["ts"] = time.monotonic()
+        return ok
+
+
+async def _periodic_optimize():
+    """Refresh SQLite planner statistics every 15 minutes."""
+    while True:
+        await asyncio.sleep(900)
+        await db.optimize()
+
+
 @asynccontextmanager
 async def lifespan(app: FastAPI):
     """
@@ -40,6 +80,12 @@ async def lifespan(app: FastAPI):
     await init_database()
     logger.info("Database initialized")
 
+    # Shared HTTP client keeps the CDP probe connection alive across requests
+    app.state.http = httpx.AsyncClient(timeout=2.0)
+
+    # Keep planner statistics fresh as task rows churn
+    optimize_task = asyncio.create_task(_periodic_optimize())
+
     # Start task queue worker
     await task_queue.start()
     logger.info("Task queue worker started")
@@ -50,6 +96,32 @@ async def lifespan(app: FastAPI):
     logger.info("Shutting down Browser-Use API Server...")
     await task_queue.stop()
     logger.info("Task queue worker stopped")
+    optimize_task.cancel()
+    try:
+        await optimize_task
+    except asyncio.CancelledError:
+        pass
+    await app.state.http.aclose()
+    await db.close()
+    logger.info("Database connection closed")
+
+
+def _encode_cursor(cursor: tuple[str, str]) -> str:
+    """Encode a (created_at, task_id) pair as an opaque cursor string."""
+    return base64.urlsafe_b64encode("|".join(cursor).encode()).decode()
+
+
+def _decode_cursor(cursor: str) -> tuple[str, str]:
+    """Decode an opaque cursor back to a (created_at, task_id) pair."""
+    try:
+        created_at, _, task_id = (
+            base64.urlsafe_b64decode(cursor.encode()).decode().partition("|")
+        )
+        if not task_id:
+            raise ValueError("missing task_id")
+        return created_at, task_id
+    except (binascii.Error, UnicodeDecodeError, ValueError):
+        raise HTTPException(status_code=400, detail="Invalid cursor")
 
 
 # Create FastAPI app
@@ -75,21 +147,12 @@ async def health_check():
     }
 
     # Check Chrome CDP
-    try:
-        async with httpx.AsyncClient() as client:
-            response = await client.get(
-                f"{CHROME_CDP_URL}/json/version",
-                timeout=2.0
-            )
-            health["chrome_cdp"] = "healthy" if response.status_code == 200 else "unhealthy"
-    except Exception as e:
-        logger.error(f"Chrome CDP health check failed: {e}")
-        health["chrome_cdp"] = "unhealthy"
+    health["chrome_cdp"] = "healthy" if await _cdp_alive() else "unhealthy"
 
     # Check Database
     try:
         # Simple query to verify database is accessible
-        test_task = await db.get_task("health-check-test")
+        await db.ping()
         health["database"] = "healthy"
     except Exception as e:
         logger.error(f"Database health check failed: {e}")
@@ -119,26 +182,25 @@ async def create_task(request: TaskRequest):
     The task is queued for execution and a task_id is returned immediately.
     Use GET /tasks/{task_id} to check status and results.
     """
+    # Reject up front when the queue is at capacity, rather than creating
+    # a database row and blocking on the bounded queue
+    if task_queue.is_full():
+        raise HTTPException(
+            status_code=503,
+            detail="Task queue is full. Retry after queued tasks have drained."
+        )
+
     # Check if Chrome CDP is available before accepting task
-    try:
-        async with httpx.AsyncClient() as client:
-            response = await client.get(
-                f"{CHROME_CDP_URL}/json/version",
-                timeout=2.0
-            )
-            if response.status_code != 200:
-                raise HTTPException(
-                    status_code=503,
-                    detail="Chrome CDP not responding. Start Chrome with: ./scripts/start_chrome_debug.sh"
-                )
-    except httpx.RequestError:
+    if not await _cdp_alive():
         raise HTTPException(
             status_code=503,
             detail="Chrome CDP not available. Start Chrome with: ./scripts/start_chrome_debug.sh"
         )
 
-    # Generate task ID
-    task_id = str(uuid4())
+    # Generate task ID; kept as a UUID object internally (16 bytes, one
+    # hash) and stringified only at the database and response boundaries
+    task_id = uuid4()
+    callback_url = str(request.callback_url) if request.callback_url else None
 
     # Create task in database
     task_data = await db.create_task(
@@ -146,14 +208,24 @@ async def create_task(request: TaskRequest):
         url=str(request.url),
         task_description=request.task_description,
         form_data=request.form_data,
-        callback_url=str(request.callback_url) if request.callback_url else None,
+        callback_url=callback_url,
         timeout=request.timeout
     )
 
     logger.info(f"Created task {task_id}: {request.task_description[:50]}...")
 
-    # Add task to queue for background execution
-    await task_queue.add_task(task_id)
+    # Add task to queue for background execution (prewarms callback DNS).
+    # The is_full() precheck above is only a fast path: concurrent POSTs
+    # can all pass it at capacity-1, so a full queue surfaces here as
+    # QueueFull rather than blocking the request until a worker drains.
+    try:
+        await task_queue.add_task(task_id, callback_url=callback_url)
+    except asyncio.QueueFull:
+        await db.delete_task(task_id)
+        raise HTTPException(
+            status_code=503,
+            detail="Task queue is full. Retry after queued tasks have drained."
+        )
     queue_position = task_queue.get_queue_size()
 
     return TaskResponse(
@@ -188,29 +260,34 @@ async def get_task(task_id: str):
         task_description=task["task_description"],
         result=task["result"],
         error=task["error"],
-        created_at=datetime.fromisoformat(task["created_at"]),
-        started_at=datetime.fromisoformat(task["started_at"]) if task["started_at"] else None,
-        completed_at=datetime.fromisoformat(task["completed_at"]) if task["completed_at"] else None,
+        created_at=task["created_at"],
+        started_at=task["started_at"],
+        completed_at=task["completed_at"],
     )
 
 
+# response_model is disabled here on purpose: with it set, FastAPI
+# re-validates the returned object against the model, so skipping
+# validation at construction time would buy nothing. The responses entry
+# keeps the schema in the OpenAPI docs.
 @app.get(
     "/tasks",
-    response_model=TaskListResponse,
+    response_model=None,
+    responses={200: {"model": TaskListResponse}},
     dependencies=[Depends(validate_api_key)]
 )
 async def list_tasks(
     status: str = None,
     limit: int = 50,
-    offset: int = 0
+    cursor: str = None
 ):
     """
-    List all tasks with optional filtering and pagination.
+    List all tasks with optional filtering and cursor pagination.
 
     Query parameters:
     - status: Filter by task status (queued, running, completed, failed, timeout)
     - limit: Maximum number of tasks to return (default: 50, max: 100)
-    - offset: Number of tasks to skip (default: 0)
+    - cursor: Opaque cursor from a previous response's next_cursor field
     """
     # Validate limit
     if limit > 100:
@@ -218,28 +295,34 @@ async def list_tasks(
     if limit < 1:
         limit = 1
 
-    tasks_data, total = await db.list_tasks(status=status, limit=limit, offset=offset)
+    cursor_pair = _decode_cursor(cursor) if cursor else None
+
+    tasks_data, total, next_cursor = await db.list_tasks(
+        status=status, limit=limit, cursor=cursor_pair
+    )
 
+    # The database is the source of truth here, so skip Pydantic's field
+    # validation with model_construct — it's the per-row cost in this loop.
     tasks = [
-        TaskStatus(
+        TaskStatus.model_construct(
             task_id=task["task_id"],
             status=task["status"],
             url=task["url"],
             task_description=task["task_description"],
             result=task["result"],
             error=task["error"],
-            created_at=datetime.fromisoformat(task["created_at"]),
-            started_at=datetime.fromisoformat(task["started_at"]) if task["started_at"] else None,
-            completed_at=datetime.fromisoformat(task["completed_at"]) if task["completed_at"] else None,
+            created_at=task["created_at"],
+            started_at=task["started_at"],
+            completed_at=task["completed_at"],
         )
         for task in tasks_data
     ]
 
-    return TaskListResponse(
+    return TaskListResponse.model_construct(
         tasks=tasks,
         total=total,
         limit=limit,
-        offset=offset
+        next_cursor=_encode_cursor(next_cursor) if next_cursor else None
     )
 
 
@@ -255,19 +338,20 @@ async def get_queue_status():
     Returns information about queued tasks and current execution.
     """
     queue_length = task_queue.get_queue_size()
-    current_task = task_queue.get_current_task()
+    current_tasks = task_queue.get_current_tasks()
 
-    # Calculate estimated completion (simplified - assumes 2 min per task)
+    # Calculate estimated completion (simplified - assumes 2 min per task,
+    # spread over the concurrent workers)
     estimated_completion = None
-    if current_task or queue_length > 0:
+    if current_tasks or queue_length > 0:
         # This is a rough estimate - in production you'd track actual task durations
-        minutes_remaining = queue_length * 2
+        minutes_remaining = queue_length * 2 / task_queue.concurrency
         from datetime import timedelta
         estimated_completion = datetime.utcnow() + timedelta(minutes=minutes_remaining)
 
     return QueueStatus(
         queue_length=queue_length,
-        current_task=current_task,
+        current_task={"task_ids": current_tasks} if current_tasks else None,
         estimated_completion=estimated_completion
     )
 
@@ -5,259 +5,492 @@ Executes tasks using browser-use Agent with Chrome CDP connection.
 import asyncio
 import logging
 import json
-from datetime import datetime
+import random
+import time
+from datetime import datetime, timezone
+from email.utils import parsedate_to_datetime
 from typing import Optional, Dict, Any
+from urllib.parse import urlsplit
 from uuid import UUID
 
 import httpx
 from browser_use import Agent, Browser, ChatBrowserUse
 
+# asyncio.timeout (3.11+) avoids the extra Task that asyncio.wait_for
+# spawns per call; fall back to the async_timeout package on older Pythons.
+try:
+    from asyncio import timeout as async_timeout
+except ImportError:  # Python < 3.11
+    from async_timeout import timeout as async_timeout
+
 from api.config import (
+    CALLBACK_BUDGET,
     CHROME_CDP_URL,
+    MAX_QUEUE_SIZE,
+    TASK_CONCURRENCY,
+    WEBHOOK_MAX_DELAY,
     WEBHOOK_RETRY_ATTEMPTS,
     WEBHOOK_RETRY_DELAY,
     WEBHOOK_TIMEOUT,
 )
-from api.database import db
+from api.database import StatusBatcher, db
 from api.models import CallbackPayload
 
+# orjson is several times faster than stdlib json and emits bytes
+# directly; fall back to stdlib where it isn't installed (same pattern
+# as api.database).
+try:
+    import orjson
+
+    def _json_dumps_bytes(obj) -> bytes:
+        return orjson.dumps(obj)
+
+    def _json_dumps_compact(obj) -> str:
+        return orjson.dumps(obj).decode()
+
+    _json_loads = orjson.loads
+except ImportError:
+    def _json_dumps_bytes(obj) -> bytes:
+        return json.dumps(obj).encode()
+
+    def _json_dumps_compact(obj) -> str:
+        return json.dumps(obj, separators=(",", ":"))
+
+    _json_loads = json.loads
+
 logger = logging.getLogger("api")
 
+# Pushed onto the queue at shutdown so the worker wakes and exits without
+# needing a periodic poll of self.running
+_SHUTDOWN_SENTINEL = object()
+
+# How long a prewarmed DNS resolution is considered fresh
+_DNS_TTL = 300.0
+
+# Full tracebacks logged per exception type per window before the worker
+# downgrades to a one-line warning
+_EXC_LOG_LIMIT = 3
+_EXC_LOG_WINDOW = 60.0
+
+
+def _retry_after_seconds(response: httpx.Response) -> Optional[float]:
+    """Parse a Retry-After header (delta-seconds or HTTP-date) into seconds."""
+    value = response.headers.get("Retry-After")
+    if not value:
+        return None
+    try:
+        return max(0.0, float(value))
+    except ValueError:
+        pass
+    try:
+        retry_at = parsedate_to_datetime(value)
+    except (TypeError, ValueError):
+        return None
+    return max(0.0, (retry_at - datetime.now(timezone.utc)).total_seconds())
+
 
 class TaskQueue:
     """
-    Manages the task queue and background worker.
-    Processes tasks sequentially using browser-use Agent.
+    Manages the task queue and background workers.
+    Processes tasks concurrently using browser-use Agent: each task is
+    dominated by LLM and network latency, so overlapping them gives
+    near-linear throughput gains.
     """
 
-    def __init__(self):
-        self.queue: asyncio.Queue = asyncio.Queue()
-        self.current_task_id: Optional[str] = None
-        self.worker_task: Optional[asyncio.Task] = None
+    def __init__(self, concurrency: int = TASK_CONCURRENCY):
+        # Bounded so a submission burst backs up at the API layer (503)
+        # instead of growing the queue without limit
+        self.queue: asyncio.Queue = asyncio.Queue(maxsize=MAX_QUEUE_SIZE)
+        self.concurrency = concurrency
+        self.current_task_ids: set[UUID] = set()
         self.running = False
+        self._workers: list[asyncio.Task] = []
+        # Shared client so callback retries and successive tasks reuse
+        # pooled connections instead of a fresh handshake per attempt
+        self._http: Optional[httpx.AsyncClient] = None
+        # Coalesces status UPDATEs from concurrent workers into one commit
+        self._status_batcher = StatusBatcher(db)
+        # One pooled Browser/CDP connection per worker, built lazily
+        self._browsers: Dict[int, Browser] = {}
+        # (host, port) -> monotonic time of the last DNS prewarm
+        self._dns_cache: Dict[tuple, float] = {}
+        # Strong refs to fire-and-forget tasks: the loop only keeps weak
+        # ones, so an unreferenced task can be collected before it runs
+        self._background_tasks: set = set()
+        # exception type -> (window start, tracebacks logged this window)
+        self._exc_seen: Dict[type, tuple] = {}
 
     async def start(self):
-        """Start the background worker."""
+        """Start the background workers."""
         if self.running:
-            logger.warning("Task queue worker already running")
+            logger.warning("Task queue workers already running")
             return
 
         self.running = True
-        self.worker_task = asyncio.create_task(self._worker())
-        logger.info("Task queue worker started")
+        self._http = httpx.AsyncClient(
+            timeout=WEBHOOK_TIMEOUT,
+            limits=httpx.Limits(max_keepalive_connections=32),
+        )
+        await self._status_batcher.start()
+        self._workers = [
+            asyncio.create_task(self._worker(worker_id))
+            for worker_id in range(self.concurrency)
+        ]
+        logger.info("Started %d task queue workers", self.concurrency)
 
     async def stop(self):
-        """Stop the background worker gracefully."""
-        logger.info("Stopping task queue worker...")
+        """Stop the background workers gracefully."""
+        logger.info("Stopping task queue workers...")
         self.running = False
 
-        if self.worker_task:
-            self.worker_task.cancel()
+        if self._workers:
+            # Wake every worker that's blocked on an empty queue. The queue
+            # is bounded, so never block here: a full queue means no worker
+            # is waiting on get() — they're mid-task and will exit via the
+            # running flag — and an awaited put would deadlock shutdown.
+            for _ in self._workers:
+                try:
+                    self.queue.put_nowait(_SHUTDOWN_SENTINEL)
+                except asyncio.QueueFull:
+                    break
+            await asyncio.gather(*self._workers, return_exceptions=True)
+            self._workers = []
+
+        await self._status_batcher.stop()
+
+        for worker_id, browser in list(self._browsers.items()):
             try:
-                await self.worker_task
-            except asyncio.CancelledError:
-                pass
+                await browser.stop()
+            except Exception as e:
+                logger.debug("Error closing browser for worker %d: %s", worker_id, e)
+        self._browsers.clear()
+
+        if self._http:
+            await self._http.aclose()
+            self._http = None
+
+        logger.info("Task queue workers stopped")
+
+    async def add_task(self, task_id: UUID, callback_url: Optional[str] = None):
+        """
+        Add a task to the queue, prewarming DNS for its callback host.
+
+        Raises:
+            asyncio.QueueFull: If the queue is at capacity. Never blocks
+                the caller waiting for a slot; the API layer turns this
+                into a 503.
+        """
+        self.queue.put_nowait(task_id)
+        logger.info("Task %s added to queue (position: %d)", task_id, self.queue.qsize())
 
-        logger.info("Task queue worker stopped")
+        # Resolve the callback host now, while the browser work runs, so
+        # the first callback attempt skips the DNS lookup
+        if callback_url:
+            prewarm = asyncio.create_task(self._prewarm_dns(callback_url))
+            self._background_tasks.add(prewarm)
+            prewarm.add_done_callback(self._background_tasks.discard)
 
-    async def add_task(self, task_id: str):
-        """Add a task to the queue."""
-        await self.queue.put(task_id)
-        logger.info(f"Task {task_id} added to queue (position: {self.queue.qsize()})")
+    async def _prewarm_dns(self, callback_url: str):
+        """
+        Resolve a callback URL's host ahead of time.
+
+        getaddrinfo populates the resolver cache, so by the time the task
+        finishes and _send_callback runs, the lookup is a cache hit and the
+        first attempt only pays for the TCP/TLS handshake.
+        """
+        parts = urlsplit(callback_url)
+        host = parts.hostname
+        if not host:
+            return
+        port = parts.port or (443 if parts.scheme == "https" else 80)
+
+        key = (host, port)
+        now = time.monotonic()
+        if now - self._dns_cache.get(key, -_DNS_TTL) < _DNS_TTL:
+            return
+
+        try:
+            await asyncio.get_running_loop().getaddrinfo(host, port)
+            self._dns_cache[key] = now
+        except OSError as e:
+            logger.debug("DNS prewarm for %s failed: %s", host, e)
 
     def get_queue_size(self) -> int:
         """Get current queue size."""
         return self.queue.qsize()
 
-    def get_current_task(self) -> Optional[Dict[str, Any]]:
-        """Get currently executing task info."""
-        if self.current_task_id:
-            return {"task_id": self.current_task_id}
-        return None
+    def is_full(self) -> bool:
+        """Whether the queue has reached its configured capacity."""
+        return self.queue.full()
 
-    async def _worker(self):
+    def get_current_tasks(self) -> list[str]:
+        """Get IDs of the tasks currently executing."""
+        return sorted(str(task_id) for task_id in self.current_task_ids)
+
+    def _log_exc(self, e: BaseException, msg: str, *args):
+        """
+        Log an exception, throttling traceback capture per exception type.
+
+        Formatting a full traceback on every failure is expensive when the
+        same error repeats in a tight loop (e.g. a downed CDP endpoint), so
+        only the first few per type per window get exc_info; the rest are
+        summarized in a one-line warning.
+        """
+        exc_type = type(e)
+        now = time.monotonic()
+        window_start, count = self._exc_seen.get(exc_type, (now, 0))
+        if now - window_start >= _EXC_LOG_WINDOW:
+            window_start, count = now, 0
+
+        self._exc_seen[exc_type] = (window_start, count + 1)
+        if count < _EXC_LOG_LIMIT:
+            logger.error(msg, *args, exc_info=True)
+        else:
+            logger.warning("Suppressed traceback for %s: %s", exc_type.__name__, e)
+
+    async def _worker(self, worker_id: int):
         """
         Background worker that processes tasks from the queue.
         Runs continuously until stopped.
         """
-        logger.info("Task queue worker loop started")
+        logger.info("Task queue worker %d loop started", worker_id)
 
         while self.running:
+            task_id = None
             try:
-                # Wait for a task (with timeout to allow checking self.running)
-                try:
-                    task_id = await asyncio.wait_for(
-                        self.queue.get(),
-                        timeout=1.0
-                    )
-                except asyncio.TimeoutError:
-                    continue
+                # Block until a task (or the shutdown sentinel) arrives;
+                # the loop sleeps instead of waking every second to poll
+                task_id = await self.queue.get()
+                if task_id is _SHUTDOWN_SENTINEL:
+                    break
 
-                self.current_task_id = task_id
-                logger.info(f"Processing task {task_id}")
+                self.current_task_ids.add(task_id)
+                logger.info("Worker %d processing task %s", worker_id, task_id)
 
                 # Execute the task
-                await self._execute_task(task_id)
+                await self._execute_task(worker_id, task_id)
 
-                self.current_task_id = None
+                self.current_task_ids.discard(task_id)
                 self.queue.task_done()
 
             except asyncio.CancelledError:
-                logger.info("Worker task cancelled")
+                logger.info("Worker %d cancelled", worker_id)
                 break
             except Exception as e:
-                logger.error(f"Error in worker loop: {e}", exc_info=True)
-                self.current_task_id = None
+                self._log_exc(e, "Error in worker %d loop: %s", worker_id, e)
+                if task_id is not None:
+                    self.current_task_ids.discard(task_id)
 
-        logger.info("Task queue worker loop ended")
+        logger.info("Task queue worker %d loop ended", worker_id)
 
-    async def _execute_task(self, task_id: str):
+    async def _execute_task(self, worker_id: int, task_id: UUID):
         """
         Execute a single task using browser-use Agent.
 
         Args:
+            worker_id: Worker executing the task
             task_id: The UUID of the task to execute
         """
-        started_at = datetime.utcnow()
+        # Wall-clock snapshot for storage; monotonic clock for durations
+        # (cheaper and immune to clock adjustments)
+        started_at = datetime.now(timezone.utc)
+        started_monotonic = time.monotonic()
+
+        # Get task from database once (full row: the worker needs form_data,
+        # callback_url and timeout); the error paths below reuse this dict
+        # instead of re-fetching it
+        task = await db.get_task_full(task_id)
+        if not task:
+            logger.error("Task %s not found in database", task_id)
+            return
 
-        try:
-            # Get task from database
-            task = await db.get_task(task_id)
-            if not task:
-                logger.error(f"Task {task_id} not found in database")
-                return
+        # Reserve a slice of the declared timeout for finalization, scaled
+        # so a short task keeps most of its budget (a flat CALLBACK_BUDGET
+        # would eat half of the API's 30-second minimum)
+        deadline = max(
+            task["timeout"] - min(CALLBACK_BUDGET, task["timeout"] // 10), 1
+        )
 
+        try:
             # Update status to running
-            await db.update_status(
-                task_id=task_id,
-                status="running",
-                started_at=started_at
-            )
-            logger.info(f"Task {task_id} status updated to 'running'")
-
-            # Parse form_data from JSON string
-            form_data = {}
-            if task["form_data"]:
-                try:
-                    form_data = json.loads(task["form_data"])
-                except json.JSONDecodeError:
-                    logger.warning(f"Invalid JSON in form_data for task {task_id}")
-
-            # Build task description with form data context
-            task_description = task["task_description"]
-            if form_data:
-                task_description += f"\n\nForm data to use: {json.dumps(form_data, indent=2)}"
-
-            # Execute browser automation
-            result = await self._run_browser_task(
-                task_id=task_id,
-                url=task["url"],
-                task_description=task_description,
-                timeout=task["timeout"]
-            )
+            await self._status_batcher.mark_running(task_id, started_at)
+            logger.info("Task %s status updated to 'running'", task_id)
+
+            # One deadline covers everything from here to the result:
+            # browser setup and form handling draw from the same budget as
+            # agent.run(), so the declared timeout is enforced end to end
+            async with async_timeout(deadline):
+                # form_data may be empty, already a dict, or a stored JSON
+                # string; skip the parse entirely when we can
+                raw_form_data = task["form_data"]
+                form_data = None
+                if isinstance(raw_form_data, dict):
+                    form_data = raw_form_data
+                elif raw_form_data:
+                    try:
+                        form_data = _json_loads(raw_form_data)
+                    except ValueError:
+                        logger.warning("Invalid JSON in form_data for task %s", task_id)
+
+                # Build task description with form data context. Compact dump:
+                # the LLM doesn't need pretty-printing and the extra whitespace
+                # costs tokens on every step.
+                task_description = task["task_description"]
+                if form_data:
+                    task_description += f"\n\nForm data to use: {_json_dumps_compact(form_data)}"
+
+                # Execute browser automation
+                result = await self._run_browser_task(
+                    worker_id=worker_id,
+                    task_id=task_id,
+                    url=task["url"],
+                    task_description=task_description
+                )
 
-            # Update status to completed
-            completed_at = datetime.utcnow()
-            await db.update_status(
+            # Update status to completed and fire the callback in parallel:
+            # the two are independent, and serializing them would add the
+            # full webhook round trip (plus retries) to finalization
+            completed_at = datetime.now(timezone.utc)
+            await self._finalize(
+                self._status_batcher.mark_completed(task_id, completed_at, result),
                 task_id=task_id,
+                callback_url=task["callback_url"],
                 status="completed",
-                completed_at=completed_at,
-                result=result
+                result=result,
+                error=None,
+                completed_at=completed_at
+            )
+            logger.info(
+                "Task %s completed successfully in %.1fs",
+                task_id, time.monotonic() - started_monotonic
             )
-            logger.info(f"Task {task_id} completed successfully")
-
-            # Send callback if provided
-            if task["callback_url"]:
-                await self._send_callback(
-                    task_id=task_id,
-                    callback_url=task["callback_url"],
-                    status="completed",
-                    result=result,
-                    error=None,
-                    completed_at=completed_at
-                )
 
-        except asyncio.TimeoutError:
-            # Task exceeded timeout
-            completed_at = datetime.utcnow()
-            error_msg = f"Task exceeded timeout of {task['timeout']} seconds"
-            logger.warning(f"Task {task_id} timed out")
+        except (asyncio.TimeoutError, TimeoutError):
+            # Pipeline exceeded its deadline. The deadline unwinds
+            # agent.run() with CancelledError, which skips the discard in
+            # _run_browser_task's Exception handler — drop the browser here
+            # so the next task doesn't reuse one cancelled mid-CDP-operation
+            self._discard_browser(worker_id)
+            completed_at = datetime.now(timezone.utc)
+            error_msg = (
+                f"Task exceeded pipeline deadline of {deadline} seconds "
+                f"(declared timeout {task['timeout']}s)"
+            )
+            logger.warning("Task %s pipeline timed out after %ds", task_id, deadline)
 
-            await db.update_status(
+            await self._finalize(
+                self._status_batcher.mark_failed(task_id, "timeout", completed_at, error_msg),
                 task_id=task_id,
+                callback_url=task.get("callback_url"),
                 status="timeout",
-                completed_at=completed_at,
-                error=error_msg
+                result=None,
+                error=error_msg,
+                completed_at=completed_at
             )
 
-            # Send callback for timeout
-            if task.get("callback_url"):
-                await self._send_callback(
-                    task_id=task_id,
-                    callback_url=task["callback_url"],
-                    status="timeout",
-                    result=None,
-                    error=error_msg,
-                    completed_at=completed_at
-                )
-
         except Exception as e:
             # Task failed with error
-            completed_at = datetime.utcnow()
+            completed_at = datetime.now(timezone.utc)
             error_msg = f"Task execution error: {str(e)}"
-            logger.error(f"Task {task_id} failed: {error_msg}", exc_info=True)
+            self._log_exc(e, "Task %s failed: %s", task_id, error_msg)
 
-            await db.update_status(
+            await self._finalize(
+                self._status_batcher.mark_failed(task_id, "failed", completed_at, error_msg),
                 task_id=task_id,
+                callback_url=task.get("callback_url"),
                 status="failed",
-                completed_at=completed_at,
-                error=error_msg
+                result=None,
+                error=error_msg,
+                completed_at=completed_at
             )
 
-            # Send callback for failure
-            task = await db.get_task(task_id)
-            if task and task.get("callback_url"):
-                await self._send_callback(
-                    task_id=task_id,
-                    callback_url=task["callback_url"],
-                    status="failed",
-                    result=None,
-                    error=error_msg,
-                    completed_at=completed_at
-                )
+    async def _finalize(
+        self,
+        status_write,
+        task_id: UUID,
+        callback_url: Optional[str],
+        status: str,
+        result: Optional[str],
+        error: Optional[str],
+        completed_at: datetime
+    ):
+        """
+        Run the terminal status write and the webhook callback concurrently.
+
+        Args:
+            status_write: Awaitable performing the final status UPDATE
+            task_id: Task UUID
+            callback_url: Webhook URL, or None to skip the callback
+            status: Terminal status (completed, failed, timeout)
+            result: Task result (if successful)
+            error: Error message (if failed)
+            completed_at: Completion timestamp
+        """
+        if not callback_url:
+            await status_write
+            return
+
+        await asyncio.gather(
+            status_write,
+            self._send_callback(
+                task_id=task_id,
+                callback_url=callback_url,
+                status=status,
+                result=result,
+                error=error,
+                completed_at=completed_at
+            )
+        )
+
+    async def _ensure_browser(self, worker_id: int) -> Browser:
+        """
+        Get this worker's pooled Browser, creating it on first use.
+        Reusing the instance avoids the CDP handshake on every task.
+        """
+        browser = self._browsers.get(worker_id)
+        if browser is None:
+            browser = Browser(cdp_url=CHROME_CDP_URL)
+            self._browsers[worker_id] = browser
+            logger.info("Worker %d connected to Chrome CDP at %s", worker_id, CHROME_CDP_URL)
+        return browser
+
+    def _discard_browser(self, worker_id: int):
+        """Drop a worker's cached browser so the next task reconnects."""
+        self._browsers.pop(worker_id, None)
 
     async def _run_browser_task(
         self,
-        task_id: str,
+        worker_id: int,
+        task_id: UUID,
         url: str,
-        task_description: str,
-        timeout: int
+        task_description: str
     ) -> str:
         """
         Execute browser automation using browser-use Agent.
 
+        The caller's pipeline deadline bounds this; there is no separate
+        timeout here.
+
         Args:
+            worker_id: Worker executing the task (selects the pooled browser)
             task_id: Task UUID for logging
             url: Target URL
             task_description: Natural language task description
-            timeout: Timeout in seconds
 
         Returns:
             str: Result message from the agent
 
         Raises:
-            asyncio.TimeoutError: If task exceeds timeout
             Exception: If browser automation fails
         """
-        logger.info(f"Starting browser automation for task {task_id}")
-        logger.info(f"URL: {url}")
-        logger.info(f"Description: {task_description[:100]}...")
+        logger.info("Starting browser automation for task %s", task_id)
+        logger.info("URL: %s", url)
+        if logger.isEnabledFor(logging.INFO):
+            logger.info("Description: %s...", task_description[:100])
 
-        browser = None
         try:
-            # Create Browser instance with CDP connection
-            browser = Browser(cdp_url=CHROME_CDP_URL)
-            logger.info(f"Connected to Chrome CDP at {CHROME_CDP_URL}")
+            # Reuse this worker's Browser/CDP connection across tasks
+            browser = await self._ensure_browser(worker_id)
 
             # Create Agent with ChatBrowserUse (optimized model)
             agent = Agent(
@@ -266,15 +499,12 @@ class TaskQueue:
                 browser=browser,
             )
 
-            # Execute task with timeout
-            logger.info(f"Executing agent task (timeout: {timeout}s)")
-            result = await asyncio.wait_for(
-                agent.run(),
-                timeout=timeout
-            )
+            # Execute task (bounded by the caller's pipeline deadline)
+            logger.info("Executing agent task")
+            result = await agent.run()
 
-            logger.info(f"Agent execution completed for task {task_id}")
-            logger.debug(f"Result: {result}")
+            logger.info("Agent execution completed for task %s", task_id)
+            logger.debug("Result: %s", result)
 
             # Convert result to string if needed
             if hasattr(result, 'final_result'):
@@ -284,24 +514,16 @@ class TaskQueue:
 
             return result_str
 
-        except asyncio.TimeoutError:
-            logger.warning(f"Browser task {task_id} exceeded timeout of {timeout}s")
-            raise
-
         except Exception as e:
-            logger.error(f"Browser task {task_id} failed: {e}", exc_info=True)
+            # The CDP connection may be what failed; rebuild lazily on the
+            # next task instead of reusing a possibly dead browser
+            self._discard_browser(worker_id)
+            self._log_exc(e, "Browser task %s failed: %s", task_id, e)
             raise
 
-        finally:
-            # Clean up browser resources
-            # Note: Browser with CDP connection doesn't need explicit cleanup
-            # The CDP connection stays open for reuse
-            if browser:
-                logger.debug(f"Browser task {task_id} cleanup complete")
-
     async def _send_callback(
         self,
-        task_id: str,
+        task_id: UUID,
         callback_url: str,
         status: str,
         result: Optional[str],
@@ -320,44 +542,73 @@ class TaskQueue:
             completed_at: Completion timestamp
         """
         payload = CallbackPayload(
-            task_id=task_id,
+            task_id=str(task_id),
             status=status,
             result=result,
             error=error,
             completed_at=completed_at
         )
 
-        logger.info(f"Sending callback for task {task_id} to {callback_url}")
+        # Serialize once; every retry attempt reuses the same bytes instead
+        # of re-running the Pydantic dump + json encode
+        body_bytes = _json_dumps_bytes(payload.model_dump(mode="json"))
+        headers = {"content-type": "application/json"}
+
+        logger.info("Sending callback for task %s to %s", task_id, callback_url)
 
         # Retry logic with exponential backoff
         for attempt in range(WEBHOOK_RETRY_ATTEMPTS):
+            retry_after = None
             try:
-                async with httpx.AsyncClient() as client:
-                    response = await client.post(
-                        callback_url,
-                        json=payload.model_dump(),
-                        timeout=WEBHOOK_TIMEOUT
-                    )
-                    response.raise_for_status()
+                response = await self._http.post(
+                    callback_url,
+                    content=body_bytes,
+                    headers=headers
+                )
+                response.raise_for_status()
 
-                logger.info(f"Callback sent successfully for task {task_id} (attempt {attempt + 1})")
-                await db.update_callback_attempt(task_id, attempt + 1, None)
+                logger.info("Callback sent successfully for task %s (attempt %d)", task_id, attempt + 1)
+                await self._status_batcher.update_callback_attempt(task_id, attempt + 1, None)
                 return
 
-            except Exception as e:
+            except httpx.HTTPStatusError as e:
+                status_code = e.response.status_code
                 error_msg = f"Callback attempt {attempt + 1} failed: {str(e)}"
                 logger.warning(error_msg)
+                await self._status_batcher.update_callback_attempt(task_id, attempt + 1, error_msg)
+
+                # A definitive 4xx (bad URL, auth, payload) won't improve on
+                # retry; only 408/429 and 5xx are worth another attempt
+                if status_code < 500 and status_code not in (408, 429):
+                    logger.error(
+                        "Callback for task %s rejected with non-retryable status %d",
+                        task_id, status_code
+                    )
+                    return
 
-                # Update database with attempt info
-                await db.update_callback_attempt(task_id, attempt + 1, error_msg)
+                # Honor the server's backoff hint when it gives one
+                retry_after = _retry_after_seconds(e.response)
 
-                # Retry with exponential backoff (unless last attempt)
-                if attempt < WEBHOOK_RETRY_ATTEMPTS - 1:
-                    wait_time = WEBHOOK_RETRY_DELAY * (2 ** attempt)
-                    logger.info(f"Retrying callback in {wait_time}s...")
-                    await asyncio.sleep(wait_time)
+            except Exception as e:
+                error_msg = f"Callback attempt {attempt + 1} failed: {str(e)}"
+                logger.warning(error_msg)
 
-        logger.error(f"All callback attempts failed for task {task_id}")
+                # Update database with attempt info
+                await self._status_batcher.update_callback_attempt(task_id, attempt + 1, error_msg)
+
+            # Retry with full-jitter exponential backoff (unless last
+            # attempt): spreading retries over the window keeps many
+            # failing callbacks from re-hitting the endpoint in lockstep
+            if attempt < WEBHOOK_RETRY_ATTEMPTS - 1:
+                if retry_after is not None:
+                    wait_time = min(retry_after, WEBHOOK_MAX_DELAY)
+                else:
+                    exp_delay = WEBHOOK_RETRY_DELAY * (2 ** attempt)
+                    wait_time = random.uniform(0, min(exp_delay, WEBHOOK_MAX_DELAY))
+                logger.info("Retrying callback in %.1fs...", wait_time)
+                await asyncio.sleep(wait_time)
+
+        logger.error("All callback attempts failed for task %s", task_id)
 
 
 # Global task queue instance
@@ -0,0 +1,17 @@
+"""
+Shared environment loading for the example scripts.
+"""
+from functools import cache
+
+from dotenv import load_dotenv
+
+ENV_FILE = '/Users/antonadmin/.browser-use.env'
+
+
+@cache
+def ensure_env(path: str = ENV_FILE):
+    """
+    Load API keys from the env file exactly once per process.
+    Examples call this from main() so importing a module never hits disk.
+    """
+    load_dotenv(path)
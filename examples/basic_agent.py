@@ -3,13 +3,14 @@ Basic Browser-Use Agent Example
 Run: python examples/basic_agent.py
 """
 import asyncio
-from dotenv import load_dotenv
 from browser_use import Agent, ChatOpenAI
 
-# Load API keys
-load_dotenv('/Users/antonadmin/.browser-use.env')
+from _env import ensure_env
 
 async def main():
+    # Load API keys
+    ensure_env()
+
     # Create agent with OpenAI
     agent = Agent(
         task="Go to google.com and search for 'browser automation python'",
@@ -4,10 +4,11 @@ Tests that all new import patterns work correctly.
 """
 import asyncio
 import os
-from dotenv import load_dotenv
+
+from _env import ensure_env
 
 # Load environment variables
-load_dotenv('/Users/antonadmin/.browser-use.env')
+ensure_env()
 
 print("=" * 50)
 print("Browser-Use 0.11.2 Import Test")
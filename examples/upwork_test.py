@@ -4,12 +4,13 @@ Tests basic Upwork navigation - does NOT submit applications
 Run: python examples/upwork_test.py
 """
 import asyncio
-from dotenv import load_dotenv
 from browser_use import Agent, BrowserSession, ChatOpenAI
 
-load_dotenv('/Users/antonadmin/.browser-use.env')
+from _env import ensure_env
 
 async def main():
+    ensure_env()
+
     # Use persistent browser session for login state
     browser_session = BrowserSession(
         executable_path='/Applications/Google Chrome.app/Contents/MacOS/Google Chrome',
@@ -4,12 +4,13 @@ Uses existing Chrome profile for persistent logins
 Run: python examples/with_browser_session.py
 """
 import asyncio
-from dotenv import load_dotenv
 from browser_use import Agent, BrowserSession, ChatOpenAI
 
-load_dotenv('/Users/antonadmin/.browser-use.env')
+from _env import ensure_env
 
 async def main():
+    ensure_env()
+
     # Create browser session with Chrome
     browser_session = BrowserSession(
         executable_path='/Applications/Google Chrome.app/Contents/MacOS/Google Chrome',
@@ -3,12 +3,13 @@ Using Google Gemini with Browser-Use
 Run: python examples/with_gemini.py
 """
 import asyncio
-from dotenv import load_dotenv
 from browser_use import Agent, ChatGoogle
 
-load_dotenv('/Users/antonadmin/.browser-use.env')
+from _env import ensure_env
 
 async def main():
+    ensure_env()
+
     # Use Gemini Flash - fast and capable
     llm = ChatGoogle(model='gemini-2.0-flash')
     